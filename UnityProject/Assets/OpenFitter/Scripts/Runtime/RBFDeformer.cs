@@ -30,6 +30,11 @@ public class RBFShapeKeyData
     public List<List<float>> centers;
     public List<List<float>> weights;
     public List<List<float>> poly_weights;
+    // Base64-encoded little-endian float32 arrays, used instead of the lists above when exported with "Binary Arrays"
+    public string centers_b64;
+    public string weights_b64;
+    public string poly_weights_b64;
+    public string dtype; // Element type of the *_b64 arrays: "float16" when exported with "Half Precision", otherwise float32
     public List<float> bounds_min; // [x, y, z]
     public List<float> bounds_max; // [x, y, z]
 }
@@ -41,6 +46,10 @@ public class RBFData
     public List<List<float>> centers;
     public List<List<float>> weights;
     public List<List<float>> poly_weights;
+    public string centers_b64;
+    public string weights_b64;
+    public string poly_weights_b64;
+    public string dtype;
     public List<RBFShapeKeyData> shape_keys; // New field for additional shape keys
 }
 
@@ -213,9 +222,16 @@ public class RBFDeformer : MonoBehaviour
             // 軸変換: Blender (Right-Handed Z-Up) -> Unity (Left-Handed Y-Up)
             // Mapping: (-x, z, -y)
             // これはBoneDeformer.csの実装と一致させるための変更です。
-            var centersArr = ConvertToUnitySpace(data.centers);
-            var weightsArr = ConvertToUnitySpace(data.weights);
-            var polyArr = ConvertToUnitySpace(data.poly_weights);
+            var centersArr = data.centers_b64 != null ? ConvertToUnitySpace(data.centers_b64, data.dtype) : ConvertToUnitySpace(data.centers);
+            var weightsArr = data.weights_b64 != null ? ConvertToUnitySpace(data.weights_b64, data.dtype) : ConvertToUnitySpace(data.weights);
+            var polyArr = data.poly_weights_b64 != null ? ConvertToUnitySpace(data.poly_weights_b64, data.dtype) : ConvertToUnitySpace(data.poly_weights);
+
+            // Older exports wrote every input point as a center even when the fit used a subset
+            if (centersArr.Length != weightsArr.Length)
+            {
+                Debug.LogError($"RBF data has {centersArr.Length} centers but {weightsArr.Length} weights. Please re-export it with the current Blender add-on.");
+                return false;
+            }
 
             // 多項式項の入力座標系の補正
             // Poly = Bias + C_x * x_in + C_y * y_in + C_z * z_in
@@ -247,9 +263,15 @@ public class RBFDeformer : MonoBehaviour
             {
                 foreach (var skData in data.shape_keys)
                 {
-                    var skCentersArr = ConvertToUnitySpace(skData.centers);
-                    var skWeightsArr = ConvertToUnitySpace(skData.weights);
-                    var skPolyArr = ConvertToUnitySpace(skData.poly_weights);
+                    var skCentersArr = skData.centers_b64 != null ? ConvertToUnitySpace(skData.centers_b64, skData.dtype) : ConvertToUnitySpace(skData.centers);
+                    var skWeightsArr = skData.weights_b64 != null ? ConvertToUnitySpace(skData.weights_b64, skData.dtype) : ConvertToUnitySpace(skData.weights);
+                    var skPolyArr = skData.poly_weights_b64 != null ? ConvertToUnitySpace(skData.poly_weights_b64, skData.dtype) : ConvertToUnitySpace(skData.poly_weights);
+
+                    if (skCentersArr.Length != skWeightsArr.Length)
+                    {
+                        Debug.LogWarning($"Skipping shape key {skData.name}: {skCentersArr.Length} centers but {skWeightsArr.Length} weights. Please re-export it with the current Blender add-on.");
+                        continue;
+                    }
 
                     // Apply same polynomial correction
                     skPolyArr[1] = -skPolyArr[1];
@@ -333,6 +355,33 @@ public class RBFDeformer : MonoBehaviour
         return result;
     }
 
+    float3[] ConvertToUnitySpace(string base64, string dtype = null)
+    {
+        // Packed (x, y, z) float32 (or float16) triplets written by the Blender exporter
+        byte[] bytes = System.Convert.FromBase64String(base64);
+        float[] values;
+        if (dtype == "float16")
+        {
+            ushort[] halves = new ushort[bytes.Length / sizeof(ushort)];
+            System.Buffer.BlockCopy(bytes, 0, halves, 0, halves.Length * sizeof(ushort));
+            values = new float[halves.Length];
+            for (int i = 0; i < halves.Length; i++) values[i] = math.f16tof32(halves[i]);
+        }
+        else
+        {
+            values = new float[bytes.Length / sizeof(float)];
+            System.Buffer.BlockCopy(bytes, 0, values, 0, values.Length * sizeof(float));
+        }
+
+        float3[] result = new float3[values.Length / 3];
+        for (int i = 0; i < result.Length; i++)
+        {
+            // Blender (x, y, z) -> Unity (-x, z, -y)
+            result[i] = new float3(-values[i * 3], values[i * 3 + 2], -values[i * 3 + 1]);
+        }
+        return result;
+    }
+
     void ApplyRBFToAll()
     {
         foreach (var target in targets)
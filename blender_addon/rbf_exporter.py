@@ -8,28 +8,104 @@ bl_info = {
     "category": "Import-Export",
 }
 
+import base64
 import bpy
+import hashlib
 import json
+import math
 import numpy as np
 import os
+import tempfile
 import time
+import warnings
+
+try:
+    import scipy.linalg
+    from scipy.spatial.distance import cdist
+    SCIPY_AVAILABLE = True
+except ImportError:
+    # SciPy is not bundled with Blender; fall back to pure NumPy where needed.
+    SCIPY_AVAILABLE = False
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # Numba is optional; predict falls back to blocked NumPy evaluation.
+    NUMBA_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    # orjson is optional; exports fall back to the standard json module.
+    ORJSON_AVAILABLE = False
 
 # ------------------------------------------------------------------------
 # RBF Core Implementation (Embedded for portability)
 # ------------------------------------------------------------------------
 
+def pairwise_distances(a, b):
+    """Euclidean distance matrix between a (M, 3) and b (N, 3), in the dtype of a."""
+    if SCIPY_AVAILABLE:
+        # cdist always computes in float64
+        return cdist(a, b).astype(a.dtype, copy=False)
+    # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b without materializing the (M, N, 3) difference array.
+    # Computed in float64 because the expansion cancels badly in float32.
+    dtype = np.asarray(a).dtype
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    sq = np.sum(a**2, axis=1)[:, np.newaxis] + np.sum(b**2, axis=1)[np.newaxis, :] - 2.0 * (a @ b.T)
+    np.maximum(sq, 0.0, out=sq)
+    return np.sqrt(sq, out=sq).astype(dtype, copy=False)
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def multiquadric_predict_jit(V, C, W, eps_sq, out):
+        """
+        Fused multiquadric evaluation: out[i] = sum_j sqrt(|V[i] - C[j]|^2 + eps^2) * W[j]
+        Never materializes the (M, N) distance or kernel matrix.
+        """
+        M = V.shape[0]
+        N = C.shape[0]
+        for i in numba.prange(M):
+            s0 = 0.0
+            s1 = 0.0
+            s2 = 0.0
+            for j in range(N):
+                dx = V[i, 0] - C[j, 0]
+                dy = V[i, 1] - C[j, 1]
+                dz = V[i, 2] - C[j, 2]
+                r = math.sqrt(dx * dx + dy * dy + dz * dz + eps_sq)
+                s0 += r * W[j, 0]
+                s1 += r * W[j, 1]
+                s2 += r * W[j, 2]
+            out[i, 0] = s0
+            out[i, 1] = s1
+            out[i, 2] = s2
+
 class RBFCore:
     """
     RBF (Radial Basis Function) interpolation core.
     Uses Multi-Quadratic Biharmonic Kernel: sqrt(r^2 + epsilon^2)
+    
+    Points and predicted displacements are float32 to match the vertex data from
+    foreach_get. The system is solved and the kernel sums are accumulated in float64:
+    the multiquadric saddle-point system is badly conditioned, and its weights can be
+    large and cancel, so float32 loses the reproduction of the control points.
     """
 
+    # Number of query points evaluated per block in predict
+    PREDICT_TILE = 4096
+
     def __init__(self, epsilon=1.0, smoothing=0.0):
         self.epsilon = epsilon
         self.smoothing = smoothing
         self.weights = None
         self.polynomial_weights = None
         self.control_points = None
+        # ||A x - b|| of the last fit; checks reproduction of the control points without a predict
+        self.residual_norm = None
     
     def _kernel_func(self, r):
         return np.sqrt(r**2 + self.epsilon**2)
@@ -40,17 +116,29 @@ class RBFCore:
         source_points: (N, 3)
         target_points: (N, 3)
         """
-        displacements = target_points - source_points
-        self.control_points = source_points
+        self.control_points = np.ascontiguousarray(source_points, dtype=np.float32)
+        
+        source_points = self.control_points.astype(np.float64)
+        displacements = np.asarray(target_points, dtype=np.float32).astype(np.float64) - source_points
+        
+        num_pts, dim = source_points.shape
         
+        # Polynomial Matrix P (1, x, y, z)
+        P = np.ones((num_pts, dim + 1))
+        P[:, 1:] = source_points
+        
+        x = self._solve_dense(source_points, P, displacements)
+        
+        self.weights = x[:num_pts]
+        self.polynomial_weights = x[num_pts:]
+
+    def _system_matrix_dense(self, source_points, P):
         num_pts, dim = source_points.shape
         
-        # Calculate distance matrix (using numpy broadcasting)
+        # Calculate distance matrix
         # dists[i, j] = distance(source[i], source[j])
-        # Memory efficient way for larger N might be needed, but for N=3000 it's fine (~80MB)
-        d1 = source_points[:, np.newaxis, :]
-        d2 = source_points[np.newaxis, :, :]
-        dists = np.sqrt(np.sum((d1 - d2)**2, axis=2))
+        # For N=3000 this is ~72MB in float64
+        dists = pairwise_distances(source_points, source_points)
         
         # Kernel Matrix (Phi)
         phi = self._kernel_func(dists)
@@ -59,35 +147,78 @@ class RBFCore:
         if self.smoothing > 0:
             phi += np.eye(num_pts) * self.smoothing
 
-        # Polynomial Matrix P (1, x, y, z)
-        P = np.ones((num_pts, dim + 1))
-        P[:, 1:] = source_points
-        
         # Build System Matrix A
         # | Phi  P |
         # | P.T  0 |
         
-        A_top = np.hstack([phi, P])
-        A_bot = np.hstack([P.T, np.zeros((dim + 1, dim + 1))])
-        A = np.vstack([A_top, A_bot])
+        # np.block allocates A once instead of stacking two temporary row blocks
+        return np.block([[phi, P], [P.T, np.zeros((dim + 1, dim + 1))]])
+
+    def _solve_dense(self, source_points, P, displacements):
+        num_pts, dim = source_points.shape
+        A = self._system_matrix_dense(source_points, P)
         
         # RHS b
         # | displacements |
         # |       0       |
         
-        b = np.zeros((num_pts + dim + 1, dim))
-        b[:num_pts] = displacements
+        b = np.concatenate([displacements, np.zeros((dim + 1, dim))], axis=0)
         
         # Solve Ax = b
+        # A is symmetric, so use LDL^T (Bunch-Kaufman) instead of a general LU when possible.
+        # Phi of the multiquadric kernel is indefinite, which rules out Cholesky here.
         try:
-            x = np.linalg.solve(A, b)
+            if SCIPY_AVAILABLE:
+                # Ill-conditioning is expected for the multiquadric kernel; residual_norm reports the actual error
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", scipy.linalg.LinAlgWarning)
+                    x = scipy.linalg.solve(A, b, assume_a='sym')
+            else:
+                x = np.linalg.solve(A, b)
         except np.linalg.LinAlgError:
             # Fallback to least squares if singular
             reg = np.eye(A.shape[0]) * 1e-6
             x = np.linalg.lstsq(A + reg, b, rcond=None)[0]
-            
-        self.weights = x[:num_pts]
-        self.polynomial_weights = x[num_pts:]
+        
+        self.residual_norm = float(np.linalg.norm(A @ x - b))
+        return x
+
+    def predict(self, points):
+        """
+        Evaluates the fitted RBF at the given points.
+        points: (M, 3)
+        Returns (deformed_points, displacements), both (M, 3)
+        """
+        points = np.ascontiguousarray(points, dtype=np.float32)
+        num_pts, dim = points.shape
+        
+        # Kernel sums are accumulated in float64 (see class docstring)
+        points_64 = points.astype(np.float64)
+        centers_64 = self.control_points.astype(np.float64)
+        
+        # Polynomial term (1, x, y, z)
+        P = np.ones((num_pts, dim + 1))
+        P[:, 1:] = points_64
+        
+        displacements = np.empty((num_pts, dim))
+        if NUMBA_AVAILABLE:
+            multiquadric_predict_jit(points_64, centers_64, self.weights, self.epsilon**2, displacements)
+            displacements += P @ self.polynomial_weights
+        else:
+            # Blocked evaluation: the distance tile is turned into the kernel tile in place and
+            # reduced immediately, so peak memory is O(tile * N) instead of O(M * N).
+            eps_sq = self.epsilon**2
+            for start in range(0, num_pts, self.PREDICT_TILE):
+                end = min(start + self.PREDICT_TILE, num_pts)
+                phi = pairwise_distances(points_64[start:end], centers_64)
+                phi *= phi
+                phi += eps_sq
+                np.sqrt(phi, out=phi)
+                np.matmul(phi, self.weights, out=displacements[start:end])
+                displacements[start:end] += P[start:end] @ self.polynomial_weights
+        
+        displacements = displacements.astype(np.float32)
+        return points + displacements, displacements
 
 # ------------------------------------------------------------------------
 # Helper Functions
@@ -164,17 +295,129 @@ def fit_rbf_model(centers, targets, epsilon, smoothing):
     rbf.fit(centers, targets)
     return rbf
 
-def create_rbf_entry(name, weight, rbf, centers, bounds_min, bounds_max):
+# Bump when the fitting algorithm changes so stale cached fits are not reused
+RBF_CACHE_VERSION = 2
+
+def get_rbf_cache_path(source_points, target_points, params):
+    # Fits are cached by a hash of their inputs in an rbf_cache folder next to the .blend file
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(np.ascontiguousarray(source_points, dtype=np.float32).tobytes())
+    digest.update(np.ascontiguousarray(target_points, dtype=np.float32).tobytes())
+    digest.update(json.dumps(dict(params, version=RBF_CACHE_VERSION), sort_keys=True).encode())
+    
+    blend_filepath = bpy.data.filepath
+    base_dir = os.path.dirname(blend_filepath) if blend_filepath else tempfile.gettempdir()
+    return os.path.join(base_dir, "rbf_cache", f"rbf_cache_{digest.hexdigest()}.npz")
+
+def load_cached_rbf(cache_path, epsilon, smoothing):
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        with np.load(cache_path) as data:
+            rbf = RBFCore(epsilon=epsilon, smoothing=smoothing)
+            rbf.control_points = data["control_points"]
+            rbf.weights = data["weights"]
+            rbf.polynomial_weights = data["polynomial_weights"]
+    except Exception as e:
+        # A cache is best effort: truncated archives raise BadZipFile/EOFError, stale ones KeyError
+        print(f"Ignoring unreadable RBF cache {cache_path}: {e}")
+        return None
+    return rbf
+
+def save_cached_rbf(cache_path, rbf):
+    # Written to a temporary file and renamed, so an interrupted export never leaves a truncated cache
+    temp_path = None
+    try:
+        cache_dir = os.path.dirname(cache_path)
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=cache_dir, suffix=".tmp", delete=False) as f:
+            temp_path = f.name
+            np.savez(
+                f,
+                control_points=rbf.control_points,
+                weights=rbf.weights,
+                polynomial_weights=rbf.polynomial_weights
+            )
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Could not write RBF cache {cache_path}: {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def encode_float32_array(array):
+    # Little-endian float32 bytes as base64: ~5.3 chars per value instead of ~20 for a JSON number
+    return base64.b64encode(np.ascontiguousarray(array, dtype='<f4').tobytes()).decode('ascii')
+
+def encode_float16_array(array):
+    return base64.b64encode(np.ascontiguousarray(array, dtype='<f2').tobytes()).decode('ascii')
+
+def fits_float16(rbf, atol=1e-3):
+    # Checks that rounding the field to float16 keeps its predictions at the control points within atol
+    half_max = float(np.finfo(np.float16).max)
+    for array in (rbf.control_points, rbf.weights, rbf.polynomial_weights):
+        if len(array) and float(np.max(np.abs(array))) > half_max:
+            # Multiquadric weights often exceed the float16 range and would be written as inf
+            print(f"float16 export rejected (values exceed {half_max:.0f}), keeping float32")
+            return False
+    
+    quantized = RBFCore(epsilon=rbf.epsilon, smoothing=rbf.smoothing)
+    quantized.control_points = rbf.control_points.astype(np.float16).astype(np.float32)
+    quantized.weights = rbf.weights.astype(np.float16).astype(np.float32)
+    quantized.polynomial_weights = rbf.polynomial_weights.astype(np.float16).astype(np.float32)
+    
+    _, reference = rbf.predict(rbf.control_points)
+    _, approx = quantized.predict(rbf.control_points)
+    max_error = float(np.max(np.abs(approx - reference))) if len(reference) else 0.0
+    if not np.isfinite(max_error) or max_error > atol:
+        print(f"float16 export rejected (max error {max_error:.2e} > {atol:.0e}), keeping float32")
+        return False
+    return True
+
+def to_json_array(array):
+    # orjson serializes contiguous ndarrays natively, so the nested-list copy is only built for json
+    if ORJSON_AVAILABLE:
+        return np.ascontiguousarray(array)
+    return np.asarray(array).tolist()
+
+def write_json(filepath, data):
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(filepath, 'w') as f:
+            json.dump(data, f)
+
+def encode_rbf_arrays(rbf, binary=False, half=False):
+    # The centers are the fitted control points, which the greedy fit may have subsampled
+    if binary and half and fits_float16(rbf):
+        return {
+            "dtype": "float16",
+            "centers_b64": encode_float16_array(rbf.control_points),
+            "weights_b64": encode_float16_array(rbf.weights),
+            "poly_weights_b64": encode_float16_array(rbf.polynomial_weights)
+        }
+    if binary:
+        return {
+            "centers_b64": encode_float32_array(rbf.control_points),
+            "weights_b64": encode_float32_array(rbf.weights),
+            "poly_weights_b64": encode_float32_array(rbf.polynomial_weights)
+        }
     return {
+        "centers": to_json_array(rbf.control_points),
+        "weights": to_json_array(rbf.weights),
+        "poly_weights": to_json_array(rbf.polynomial_weights)
+    }
+
+def create_rbf_entry(name, weight, rbf, bounds_min, bounds_max, binary=False, half=False):
+    entry = {
         "name": name,
         "weight": weight,
-        "epsilon": float(rbf.epsilon),
-        "centers": centers.tolist(),
-        "weights": rbf.weights.tolist(),
-        "poly_weights": rbf.polynomial_weights.tolist(),
-        "bounds_min": bounds_min.tolist(),
-        "bounds_max": bounds_max.tolist()
+        "epsilon": float(rbf.epsilon)
     }
+    entry.update(encode_rbf_arrays(rbf, binary, half))
+    entry["bounds_min"] = to_json_array(bounds_min)
+    entry["bounds_max"] = to_json_array(bounds_max)
+    return entry
 
 # ------------------------------------------------------------------------
 # Blender Operator & Logic
@@ -213,19 +456,16 @@ class OPENFITTER_OT_estimate_epsilon(bpy.types.Operator):
         np.random.seed(42) # FIX: Deterministic Seed
         indices = np.random.choice(num_verts, sample_size, replace=False)
         
-        verts = np.zeros((sample_size, 3), dtype=np.float32)
         # foreach_get doesn't support indices, so we have to get all and slice, or loop.
         # Getting all is faster in Python.
-        all_verts = np.zeros((num_verts * 3), dtype=np.float32)
+        all_verts = np.empty((num_verts * 3), dtype=np.float32)
         basis_block.data.foreach_get("co", all_verts)
-        all_verts = all_verts.reshape((-1, 3))
-        verts = all_verts[indices]
+        verts = np.ascontiguousarray(all_verts.reshape((-1, 3))[indices])
         
         # Calculate average nearest neighbor distance
         # Brute force for 1000 points is 1M comparisons, fast enough.
-        d1 = verts[:, np.newaxis, :]
-        d2 = verts[np.newaxis, :, :]
-        dists = np.sqrt(np.sum((d1 - d2)**2, axis=2))
+        # pairwise_distances avoids materializing the (n, n, 3) difference array.
+        dists = pairwise_distances(verts, verts)
         
         # Mask diagonal (self-distance 0)
         np.fill_diagonal(dists, np.inf)
@@ -248,8 +488,52 @@ class OPENFITTER_OT_export_rbf_json(bpy.types.Operator):
     bl_label = "Export RBF JSON"
     
     filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    binary_arrays: bpy.props.BoolProperty(
+        name="Binary Arrays",
+        description="Store centers and weights as base64-encoded float32 instead of JSON number lists (smaller and faster to write and load)",
+        default=False
+    )
+    half_precision: bpy.props.BoolProperty(
+        name="Half Precision",
+        description="With Binary Arrays, store each field as float16 when its predictions stay within 1e-3 of the float32 result",
+        default=False
+    )
+    use_fit_cache: bpy.props.BoolProperty(
+        name="Reuse Cached Fits",
+        description="Reuse fitted RBFs from an rbf_cache folder next to the .blend file when the shape keys and fit settings are unchanged. The folder is not cleaned up automatically",
+        default=False
+    )
+    precompute_selected: bpy.props.BoolProperty(
+        name="Precompute Selected Meshes",
+        description="Also export the main deformation evaluated at the rest vertices of the other selected meshes, for tools that apply it as a lookup table. RBFDeformer ignores the table and always evaluates the RBF",
+        default=False
+    )
     
     def create_adaptive_deformation_field(self, source_points, target_points, epsilon, smoothing, max_points=1000, error_threshold=0.001):
+        """
+        Returns the adaptive deformation field for the given points, reusing a fit
+        cached on disk for identical inputs when use_fit_cache is enabled.
+        """
+        if not self.use_fit_cache:
+            return self.fit_adaptive_deformation_field(source_points, target_points, epsilon, smoothing, max_points, error_threshold)
+        
+        params = {
+            "epsilon": float(epsilon),
+            "smoothing": float(smoothing),
+            "max_points": int(max_points),
+            "error_threshold": float(error_threshold)
+        }
+        cache_path = get_rbf_cache_path(source_points, target_points, params)
+        rbf = load_cached_rbf(cache_path, epsilon, smoothing)
+        if rbf is not None:
+            print(f"Using cached RBF fit: {cache_path}")
+            return rbf
+        
+        rbf = self.fit_adaptive_deformation_field(source_points, target_points, epsilon, smoothing, max_points, error_threshold)
+        save_cached_rbf(cache_path, rbf)
+        return rbf
+
+    def fit_adaptive_deformation_field(self, source_points, target_points, epsilon, smoothing, max_points=1000, error_threshold=0.001):
         """
         Creates an adaptive deformation field using Greedy Selection.
         Selects a subset of source_points that best approximates the deformation.
@@ -303,36 +587,10 @@ class OPENFITTER_OT_export_rbf_json(bpy.types.Operator):
             if not remaining_indices:
                 break
                 
-            # We need to evaluate RBF. RBFCore doesn't have a public 'predict' method exposed easily 
-            # but we can reconstruct the evaluation logic.
-            # Or better, add a predict method to RBFCore? 
-            # For now, let's implement evaluation here to avoid changing RBFCore if possible, 
-            # but changing RBFCore is cleaner.
-            
-            # Let's assume we add a predict method to RBFCore or do it manually here.
-            # Manual evaluation:
-            # s(x) = sum(w_i * phi(|x - c_i|)) + P(x)
-            
             rem_source = source_points[remaining_indices]
             rem_target = target_points[remaining_indices]
             
-            # Distance matrix: Rem vs Active
-            # d[i, j] = dist(rem[i], active[j])
-            d1 = rem_source[:, np.newaxis, :]
-            d2 = active_source[np.newaxis, :, :]
-            dists = np.sqrt(np.sum((d1 - d2)**2, axis=2))
-            
-            phi = np.sqrt(dists**2 + epsilon**2)
-            
-            # Polynomial
-            # P = [1, x, y, z]
-            P = np.ones((len(rem_source), 4))
-            P[:, 1:] = rem_source
-            
-            # Prediction
-            # weights: (num_active, 3)
-            # poly_weights: (4, 3)
-            pred_disp = phi @ current_rbf.weights + P @ current_rbf.polynomial_weights
+            _, pred_disp = current_rbf.predict(rem_source)
             
             # Calculate Error
             # true_disp = rem_target - rem_source
@@ -428,15 +686,16 @@ class OPENFITTER_OT_export_rbf_json(bpy.types.Operator):
         # Pass max_points from props
         rbf = self.create_adaptive_deformation_field(centers, target_points, props.epsilon, props.smoothing, max_points=props.max_points)
         print(f"RBF Fit finished in {time.time() - start_time:.4f}s")
+        if rbf.residual_norm is not None:
+            print(f"RBF system residual: {rbf.residual_norm:.3e}")
         
         # Init Export Data
-        export_data = {
-            "epsilon": float(rbf.epsilon),
-            "centers": centers.tolist(),
-            "weights": rbf.weights.tolist(),
-            "poly_weights": rbf.polynomial_weights.tolist(),
-            "shape_keys": []
-        }
+        export_data = {"epsilon": float(rbf.epsilon)}
+        export_data.update(encode_rbf_arrays(rbf, self.binary_arrays, self.half_precision))
+        export_data["shape_keys"] = []
+        
+        if self.precompute_selected:
+            export_data["precomputed"] = self.precompute_displacements(context, obj, rbf)
 
         # --- 2. Additional Shape Keys ---
         target_body = props.target_body_object
@@ -446,12 +705,53 @@ class OPENFITTER_OT_export_rbf_json(bpy.types.Operator):
         else:
             self.process_fallback_keys(obj, basis_name, target_name, target_verts, props, export_data)
         
-        with open(self.filepath, 'w') as f:
-            json.dump(export_data, f)
+        write_json(self.filepath, export_data)
             
         self.report({'INFO'}, f"Saved RBF data to {self.filepath} (with {len(export_data['shape_keys'])} extra shapes)")
         return {'FINISHED'}
 
+    def precompute_displacements(self, context, obj, rbf):
+        # Evaluates the main field once at the rest vertices of each other selected mesh.
+        # The RBF is fitted in the active object's local space, so the vertices are moved there first.
+        obj_inv = np.array(obj.matrix_world.inverted(), dtype=np.float32)
+        names = []
+        point_sets = []
+        
+        for other in context.selected_objects:
+            if other == obj or other.type != 'MESH':
+                continue
+            
+            # The basis coordinates match the imported rest mesh; the evaluated mesh would
+            # include the armature pose, the current shape-key mix and generative modifiers
+            mesh = other.data
+            if mesh.shape_keys:
+                verts = extract_vertices(mesh.shape_keys.reference_key)
+            else:
+                verts = np.zeros((len(mesh.vertices), 3), dtype=np.float32)
+                mesh.vertices.foreach_get("co", verts.ravel())
+            
+            to_rbf_space = obj_inv @ np.array(other.matrix_world, dtype=np.float32)
+            names.append(other.name)
+            point_sets.append(verts @ to_rbf_space[:3, :3].T + to_rbf_space[:3, 3])
+        
+        if not point_sets:
+            return []
+        
+        # Evaluate all meshes in one predict call and split the result per mesh
+        _, displacements = rbf.predict(np.concatenate(point_sets))
+        splits = np.cumsum([len(points) for points in point_sets])[:-1]
+        
+        entries = []
+        for name, points, mesh_displacements in zip(names, point_sets, np.split(displacements, splits)):
+            print(f"Precomputed displacements for {name} ({len(points)} vertices)")
+            entries.append({
+                "name": name,
+                "vertices_b64": encode_float32_array(points),
+                "displacements_b64": encode_float32_array(mesh_displacements)
+            })
+        
+        return entries
+
     def process_target_body_keys(self, target_body, props, export_data):
         print(f"Processing shape keys from Target Body: {target_body.name}")
         
@@ -512,11 +812,11 @@ class OPENFITTER_OT_export_rbf_json(bpy.types.Operator):
             
             # Export Entries
             export_data["shape_keys"].append(create_rbf_entry(
-                key_block.name, 50.0, rbf_step1, step1_centers, min_b, max_b
+                key_block.name, 50.0, rbf_step1, min_b, max_b, self.binary_arrays, self.half_precision
             ))
             
             export_data["shape_keys"].append(create_rbf_entry(
-                key_block.name, 100.0, rbf_step2, step2_centers, min_b, max_b
+                key_block.name, 100.0, rbf_step2, min_b, max_b, self.binary_arrays, self.half_precision
             ))
 
     def process_fallback_keys(self, obj, basis_name, target_name, target_verts, props, export_data):
@@ -558,7 +858,7 @@ class OPENFITTER_OT_export_rbf_json(bpy.types.Operator):
             min_b, max_b = calculate_bounds(key_centers, props.mask_margin, enable_mirror=False)
             
             export_data["shape_keys"].append(create_rbf_entry(
-                key_block.name, 100.0, key_rbf, key_centers, min_b, max_b
+                key_block.name, 100.0, key_rbf, min_b, max_b, self.binary_arrays, self.half_precision
             ))
 
 # ------------------------------------------------------------------------
@@ -28,6 +28,9 @@ except ImportError:
 
 print(f"SciPy available: {SCIPY_AVAILABLE}")
 
+# 単位立方体の8頂点のオフセット（セルの頂点とサブセルの原点の計算に使用）
+UNIT_CUBE_OFFSETS = np.array([[dx, dy, dz] for dx in (0, 1) for dy in (0, 1) for dz in (0, 1)], dtype=np.int64)
+
 def get_scene_folder():
     """
     現在のBlenderシーンファイルのフォルダパスを取得する
@@ -566,6 +569,82 @@ def add_pose_from_json(filename="pose_data.json", avatar_data_file="avatar_data.
                 mat = active_obj.pose.bones[bone_name].matrix
                 print(f"'{humanoid_name}' ({bone_name}) bone.matrix_final {mat}")
 
+# foreach_get/foreach_setで使い回す座標バッファ（直近の要素数の1つだけを保持）
+_coordinate_buffer = None
+
+
+def get_coordinate_buffer(count):
+    """
+    foreach_get/foreach_set用の座標バッファを取得する
+    C連続かつfloat32のバッファであれば、Blender側で要素ごとの変換を行わずに一括コピーされる
+    
+    Parameters:
+    count: 座標の数
+    
+    Returns:
+    numpy.ndarray: 長さ count * 3 のfloat32配列（同じ要素数で次に呼び出すと上書きされる）
+    """
+    global _coordinate_buffer
+    # 要素数が変わった場合は新しく確保するため、以前のバッファのビューは上書きされない
+    if _coordinate_buffer is None or len(_coordinate_buffer) != count * 3:
+        _coordinate_buffer = np.empty(count * 3, dtype=np.float32)
+    return _coordinate_buffer
+
+
+def get_vertex_coordinates(collection):
+    """
+    頂点またはシェイプキーの座標をまとめて取得する
+    
+    Parameters:
+    collection: mesh.vertices や shape_key.data など co 属性を持つコレクション
+    
+    Returns:
+    numpy.ndarray: 座標の配列 (N, 3)。共有バッファのビューなので、保持する場合はコピーすること
+    """
+    buffer = get_coordinate_buffer(len(collection))
+    collection.foreach_get('co', buffer)
+    return buffer.reshape(-1, 3)
+
+
+def set_vertex_coordinates(collection, coordinates):
+    """
+    頂点またはシェイプキーの座標をまとめて設定する
+    
+    Parameters:
+    collection: mesh.vertices や shape_key.data など co 属性を持つコレクション
+    coordinates: 座標の配列 (N, 3)
+    """
+    coordinates = np.asarray(coordinates)
+    if coordinates.dtype == np.float32 and coordinates.flags['C_CONTIGUOUS']:
+        # そのまま渡せる場合はバッファへのコピーを省略する
+        collection.foreach_set('co', coordinates.reshape(-1))
+        return
+    buffer = get_coordinate_buffer(len(collection))
+    buffer.reshape(-1, 3)[:] = coordinates
+    collection.foreach_set('co', buffer)
+
+
+def transform_points(matrix, points, out=None):
+    """
+    4x4の変換行列で座標の配列をまとめて変換する
+    
+    Parameters:
+    matrix: 4x4の変換行列
+    points: 座標の配列 (N, 3)
+    out: 結果を書き込む配列 (N, 3)。省略時は新しく確保する
+    
+    Returns:
+    numpy.ndarray: 変換後の座標の配列 (N, 3)
+    """
+    points = np.asarray(points)
+    matrix = np.array(matrix, dtype=points.dtype)
+    # 一時配列を作らずに回転・スケールを適用し、その場で平行移動を加える
+    result = np.empty_like(points) if out is None else out
+    np.matmul(points, matrix[:3, :3].T, out=result)
+    result += matrix[:3, 3]
+    return result
+
+
 def get_vertices_in_scaled_bbox(source_obj, scale_factor=1.2):
     """
     選択された頂点から計算されるBounding Boxをスケールし、
@@ -586,17 +665,9 @@ def get_vertices_in_scaled_bbox(source_obj, scale_factor=1.2):
     eval_obj = source_obj.evaluated_get(depsgraph)
     
     # 全ての頂点をワールド座標に変換してBounding Box内かチェック
-    matrix_world = source_obj.matrix_world
-    vertices_in_bbox = []
-    
-    for i, vertex in enumerate(eval_obj.data.vertices):
-        world_pos = matrix_world @ Vector(vertex.co)
-        
-        # Bounding Box内かチェック
-        if (bounds_min.x <= world_pos.x <= bounds_max.x and
-            bounds_min.y <= world_pos.y <= bounds_max.y and
-            bounds_min.z <= world_pos.z <= bounds_max.z):
-            vertices_in_bbox.append(i)
+    world_positions = transform_points(source_obj.matrix_world, get_vertex_coordinates(eval_obj.data.vertices).astype(np.float64))
+    inside = np.all((world_positions >= np.array(bounds_min)) & (world_positions <= np.array(bounds_max)), axis=1)
+    vertices_in_bbox = np.flatnonzero(inside).tolist()
     
     print(f"スケールされたBounding Box内の頂点数: {len(vertices_in_bbox)}")
     return vertices_in_bbox
@@ -701,7 +772,7 @@ def calculate_target_bounding_box(target_obj, scale_factor=1.2, use_selected_ver
     return bounds_min, bounds_max
 
 
-def create_adaptive_deformation_field(target_obj, base_grid_spacing=0.005, surface_distance=2.1, max_distance=2.1, min_distance=0.0036, density_falloff=3.0, bbox_scale_factor=1.2, use_selected_vertices=False):
+def create_adaptive_deformation_field(target_obj, base_grid_spacing=0.005, surface_distance=2.1, max_distance=2.1, min_distance=0.0036, density_falloff=3.0, bbox_scale_factor=1.2, use_selected_vertices=False, bounds=None):
     """
     ターゲットメッシュから自動生成されたBounding Boxを使用して、
     距離に応じて密度が変化するDeformation Fieldを生成する
@@ -715,11 +786,18 @@ def create_adaptive_deformation_field(target_obj, base_grid_spacing=0.005, surfa
     density_falloff: 密度の減衰率（大きいほど段階的な密度の変化が急速に起こる）
     bbox_scale_factor: Bounding Boxのスケール倍率
     use_selected_vertices: Trueの場合、選択された頂点のみでBounding Boxを計算
+    bounds: 事前に計算済みの(bounds_min, bounds_max)。指定時はBounding Boxの再計算を省略
+    
+    Returns:
+    numpy.ndarray: フィールドの頂点座標の配列 (N, 3)（ワールド座標）。有効なポイントがない場合はNone
     """
     start_time = time.time()
     
     # ターゲットメッシュから自動的にBounding Boxを計算
-    bounds_min, bounds_max = calculate_target_bounding_box(target_obj, bbox_scale_factor, use_selected_vertices)
+    if bounds is None:
+        bounds_min, bounds_max = calculate_target_bounding_box(target_obj, bbox_scale_factor, use_selected_vertices)
+    else:
+        bounds_min, bounds_max = bounds
     
     # 各軸の長さを計算
     dimensions = bounds_max - bounds_min
@@ -764,29 +842,28 @@ def create_adaptive_deformation_field(target_obj, base_grid_spacing=0.005, surfa
     
     bvh = BVHTree.FromBMesh(bm)
     
-    # グリッドポイントの生成
-    vertices = []
+    # グリッドポイントの生成（レベルごとに求めた座標の配列をまとめておく）
+    point_blocks = []
     
     # 事前計算とキャッシュ
     inv_max_min_diff = 1.0 / (max_distance - min_distance)
     
-    # 適応的なグリッド生成のためのヘルパー関数（最適化）
-    def get_adaptive_spacing(distance):
-        if distance <= min_distance:
-            return 0
-        elif distance > surface_distance:
-            return float('inf')  # 範囲外のポイントは生成しない
-        else:
-            # 正規化した距離を計算（0～1の間の値）
-            normalized_distance = (distance - min_distance) * inv_max_min_diff
-            normalized_distance = min(1.0, max(0.0, normalized_distance))
-            
-            # 距離に応じて2のべき乗で間隔を増加させる
-            power = sqrt(normalized_distance) * density_falloff
-            level = int(power + 1)  # 整数部分を取得して段階化
-            
-            # 2^levelの値を計算（ビットシフトで最適化）
-            return 1 << level
+    # 適応的なグリッド生成のためのヘルパー関数（距離の配列に対してまとめて計算）
+    def get_adaptive_spacing(distances):
+        distances = np.asarray(distances, dtype=np.float64)
+        
+        # 正規化した距離を計算（0～1の間の値）
+        normalized_distance = np.clip((distances - min_distance) * inv_max_min_diff, 0.0, 1.0)
+        
+        # 距離に応じて2のべき乗で間隔を増加させる
+        power = np.sqrt(normalized_distance) * density_falloff
+        level = (power + 1).astype(np.int64)  # 整数部分を取得して段階化
+        
+        # 2^levelの値を計算（ビットシフトで最適化）
+        spacing = np.left_shift(1, level)
+        spacing[distances <= min_distance] = 0
+        spacing[distances > surface_distance] = np.iinfo(np.int64).max  # 範囲外のポイントは生成しない
+        return spacing
     
     # X軸の対称性を考慮したグリッド生成
     steps_x_positive = int(ceil(bounds_max.x / base_grid_spacing)) + 1
@@ -794,111 +871,112 @@ def create_adaptive_deformation_field(target_obj, base_grid_spacing=0.005, surfa
     steps_z = int(ceil(dimensions.z / base_grid_spacing)) + 1
     
     # 進捗表示用の変数
-    total_points = steps_x_positive * steps_y * steps_z
     processed_points = 0
     last_update = time.time()
     update_interval = 2.0  # 2秒ごとに進捗を更新
     
-    # バッチ処理用のバッファ
-    batch_size = 1000
-    batch_positions = []
-    batch_mirror_positions = []
+    # グリッド座標の原点（X>0の領域のみを走査する）
+    grid_origin = np.array([0.0, bounds_min.y, bounds_min.z])
     
-    # 処理済みの適応的間隔をキャッシュ
-    spacing_cache = {}
+    # 初期の粗いグリッドを生成し、段階的に細分化
+    initial_cell_size = 2 ** int(density_falloff+1)  # 初期セルサイズ（2のべき乗が効率的）
+    max_level = int(density_falloff+1)
+    
+    # 各レベルのセル原点をグリッド単位の整数座標で保持する
+    gx, gy, gz = np.meshgrid(
+        np.arange(0, steps_x_positive, initial_cell_size),
+        np.arange(0, steps_y, initial_cell_size),
+        np.arange(0, steps_z, initial_cell_size),
+        indexing='ij'
+    )
+    cell_origins = np.stack([gx.ravel(), gy.ravel(), gz.ravel()], axis=-1).astype(np.int64)
+    cell_size = initial_cell_size
     
-    # 段階的グリッド走査のための関数
-    def process_cell(x_start, y_start, z_start, cell_size, level=0, max_level=3):
-        nonlocal batch_positions, batch_mirror_positions, processed_points, last_update
-        
-        # セルの8つの頂点の座標を計算
-        cell_vertices = []
-        min_distance_in_cell = float('inf')
-        
-        for dx in [0, 1]:
-            for dy in [0, 1]:
-                for dz in [0, 1]:
-                    x_pos = x_start + dx * cell_size * base_grid_spacing
-                    y_pos = y_start + dy * cell_size * base_grid_spacing
-                    z_pos = z_start + dz * cell_size * base_grid_spacing
-                    
-                    vertex_pos = Vector((x_pos, y_pos, z_pos))
-                    location, normal, index, distance = bvh.find_nearest(vertex_pos)
-                    
-                    if location and distance <= surface_distance:
-                        cell_vertices.append((vertex_pos, distance))
-                        min_distance_in_cell = min(min_distance_in_cell, distance)
-        
-        # セル内に有効な頂点がない場合は処理しない
-        if not cell_vertices:
-            return
+    # 距離の上下限を判定する際の丸め誤差の許容値
+    bound_tolerance = 1e-6 * base_grid_spacing
+    
+    # 頂点の距離は範囲内かどうかの判定にしか使われないため、それより遠い検索は打ち切る
+    corner_max_distance = surface_distance + bound_tolerance
+    
+    # 再帰の代わりにレベルごとに全セルをまとめて処理する
+    for level in range(max_level + 1):
+        if len(cell_origins) == 0:
+            break
         
-        # セル内の最小距離に基づく適応的間隔を取得
-        if min_distance_in_cell in spacing_cache:
-            min_adaptive_spacing = spacing_cache[min_distance_in_cell]
-        else:
-            min_adaptive_spacing = get_adaptive_spacing(min_distance_in_cell)
-            spacing_cache[min_distance_in_cell] = min_adaptive_spacing
-        
-        # セルサイズが最小適応的間隔より大きく、最大レベルに達していない場合は分割
-        if cell_size > min_adaptive_spacing and level < max_level:
-            half_size = cell_size // 2
-            if half_size > 0:
-                # セルを8つのサブセルに分割
-                for dx in [0, 1]:
-                    for dy in [0, 1]:
-                        for dz in [0, 1]:
-                            new_x = x_start + dx * half_size * base_grid_spacing
-                            new_y = y_start + dy * half_size * base_grid_spacing
-                            new_z = z_start + dz * half_size * base_grid_spacing
-                            process_cell(new_x, new_y, new_z, half_size, level + 1, max_level)
-        else:
-            # セルの中心点を追加
-            x_center = x_start + (cell_size * base_grid_spacing) / 2
-            y_center = y_start + (cell_size * base_grid_spacing) / 2
-            z_center = z_start + (cell_size * base_grid_spacing) / 2
-            
-            center_pos = Vector((x_center, y_center, z_center))
-            location, normal, index, distance = bvh.find_nearest(center_pos)
-            
-            if location and distance <= surface_distance:
-                # バッチに追加
-                batch_positions.append(center_pos)
-                batch_mirror_positions.append(Vector((-x_center, y_center, z_center)))
-                
-                # バッチサイズに達したら処理
-                if len(batch_positions) >= batch_size:
-                    process_batch(batch_positions, batch_mirror_positions, bvh, vertices)
-                    batch_positions = []
-                    batch_mirror_positions = []
-            
-            processed_points += 1
+        half_size = cell_size // 2
+        can_split = level < max_level and half_size > 0
+        
+        # 三角不等式より、セルの各頂点の距離は「中心の距離 ± 半対角線長」の範囲に収まる
+        half_diagonal = 0.5 * cell_size * base_grid_spacing * sqrt(3) + bound_tolerance
+        
+        # 各セルの中心の距離を求める（「範囲内の距離 + このレベルの半対角線長」より遠いセルは下限で除外されるため検索を打ち切る）
+        centers = grid_origin + (cell_origins + cell_size / 2) * base_grid_spacing
+        center_distances = bvh_find_nearest_distances(bvh, centers, surface_distance + half_diagonal)
+        lower_bound = center_distances - half_diagonal
+        upper_bound = center_distances + half_diagonal
+        
+        # 全ての頂点が範囲外であることが確定したセルは処理しない
+        in_range = lower_bound <= surface_distance
+        cell_origins = cell_origins[in_range]
+        centers = centers[in_range]
+        center_distances = center_distances[in_range]
+        lower_bound = lower_bound[in_range]
+        upper_bound = upper_bound[in_range]
+        
+        # 範囲内の頂点を含むことが確定しているセル
+        resolved = upper_bound <= surface_distance
+        split_mask = np.zeros(len(cell_origins), dtype=bool)
+        
+        if can_split:
+            # 適応的間隔は距離に対して単調なので、上限でも分割が必要なセル・下限でも分割が不要なセルは確定する
+            split_certain = cell_size > get_adaptive_spacing(upper_bound)
+            keep_certain = cell_size <= get_adaptive_spacing(np.maximum(lower_bound, 0.0))
+            split_mask = resolved & split_certain
+            resolved &= split_certain | keep_certain
+        
+        # 判定が確定しないセルのみ8頂点の距離を求める（共有される頂点は1回だけ）
+        valid_cells = np.ones(len(cell_origins), dtype=bool)
+        ambiguous = np.flatnonzero(~resolved)
+        if len(ambiguous) > 0:
+            corners = (cell_origins[ambiguous][:, np.newaxis, :] + UNIT_CUBE_OFFSETS[np.newaxis, :, :] * cell_size).reshape(-1, 3)
+            unique_corners, corner_inverse = np.unique(corners, axis=0, return_inverse=True)
+            unique_distances = bvh_find_nearest_distances(bvh, grid_origin + unique_corners * base_grid_spacing, corner_max_distance)
+            unique_distances[unique_distances > surface_distance] = np.inf
+            
+            # セル内の最小距離（範囲内の頂点がないセルはinf）
+            min_distance_in_cell = unique_distances[corner_inverse.ravel()].reshape(-1, 8).min(axis=1)
+            
+            # セル内に有効な頂点がない場合は処理しない
+            valid_cells[ambiguous] = np.isfinite(min_distance_in_cell)
+            
+            # セルサイズが最小適応的間隔より大きく、最大レベルに達していない場合は分割
+            if can_split:
+                split_mask[ambiguous] = cell_size > get_adaptive_spacing(min_distance_in_cell)
+        
+        # 分割しないセルの中心点を追加（中心の距離は求め済み）
+        leaf_mask = valid_cells & ~split_mask
+        if np.any(leaf_mask):
+            # 正のX側のポイントとX軸でミラーしたポイントを交互に並べる
+            leaf_centers = centers[leaf_mask & (center_distances <= surface_distance)]
+            block = np.empty((len(leaf_centers), 2, 3))
+            block[:, 0] = leaf_centers
+            block[:, 1] = leaf_centers * np.array([-1.0, 1.0, 1.0])
+            point_blocks.append(block.reshape(-1, 3))
+            
+            processed_points += int(np.count_nonzero(leaf_mask))
             current_time = time.time()
             if current_time - last_update >= update_interval:
                 print(f"Processing: {processed_points} points")
                 last_update = current_time
-    
-    # 初期の粗いグリッドを生成し、段階的に細分化
-    initial_cell_size = 2 ** int(density_falloff+1)  # 初期セルサイズ（2のべき乗が効率的）
-    
-    # X>0の領域のグリッドポイントを生成
-    for z in range(0, steps_z, initial_cell_size):
-        z_pos = bounds_min.z + z * base_grid_spacing
         
-        for y in range(0, steps_y, initial_cell_size):
-            y_pos = bounds_min.y + y * base_grid_spacing
-            
-            for x in range(0, steps_x_positive, initial_cell_size):
-                x_pos = x * base_grid_spacing  # 正のX軸方向
-                
-                # セルを処理
-                process_cell(x_pos, y_pos, z_pos, initial_cell_size, 0, int(density_falloff+1))
+        # セルを8つのサブセルに分割して次のレベルへ
+        cell_origins = (cell_origins[split_mask][:, np.newaxis, :] + UNIT_CUBE_OFFSETS[np.newaxis, :, :] * half_size).reshape(-1, 3)
+        cell_size = half_size
     
-    # 残りのバッチを処理
-    if batch_positions:
-        process_batch(batch_positions, batch_mirror_positions, bvh, vertices)
+    # 中心の距離が有限のセルのみを出力しているため、最近接点の再検索は不要
+    vertices = np.concatenate(point_blocks) if point_blocks else np.empty((0, 3))
     
-    if not vertices:
+    if len(vertices) == 0:
         bm.free()
         print("警告: 指定された範囲内に有効なポイントが見つかりませんでした")
         return None
@@ -912,62 +990,74 @@ def create_adaptive_deformation_field(target_obj, base_grid_spacing=0.005, surfa
     return vertices
 
 
-def process_batch(positions, mirror_positions, bvh, vertices):
-    """バッチでグリッドポイントを処理する"""
-    for pos, mirror_pos in zip(positions, mirror_positions):
-        # 正のX側のポイント
-        location, normal, index, distance = bvh.find_nearest(pos)
-        if location:
-            vertices.append(pos)
-        
-        # 負のX側のポイント
-        location, normal, index, distance = bvh.find_nearest(mirror_pos)
-        if location:
-            vertices.append(mirror_pos)
+def bvh_find_nearest_distances(bvh, points, max_distance=None):
+    """
+    BVHTreeを使用して複数の座標の最近接距離をまとめて計算する
+    
+    Parameters:
+    bvh: 検索対象のBVHTree
+    points: 座標の配列 (N, 3)
+    max_distance: 検索する最大距離。指定するとそれより遠い枝の探索が打ち切られる
+    
+    Returns:
+    numpy.ndarray: 各座標の最近接距離 (N,)。最近接点が見つからない場合はinf
+    """
+    distances = np.full(len(points), np.inf)
+    find_nearest = bvh.find_nearest
+    extra_args = () if max_distance is None else (max_distance,)
+    for i, co in enumerate(np.asarray(points).tolist()):
+        location, normal, index, distance = find_nearest(co, *extra_args)
+        if location is not None:
+            distances[i] = distance
+    return distances
 
 
-def compute_distances_to_source_mesh(target_vertices, source_obj):
+def build_world_space_bvh(source_obj):
     """
-    ターゲットメッシュの各頂点からソースメッシュの最近接面までの距離を計算
-    BVHTreeを使用して高速に距離を計算
+    ソースメッシュをワールド座標に変換したBVHツリーを構築する
     
     Parameters:
-    - target_vertices: ターゲットメッシュの頂点座標（ワールド座標）
     - source_obj: ソースメッシュオブジェクト
     
     Returns:
-    - 各ターゲット頂点からソースメッシュまでの距離の配列
+    - ワールド座標のBVHTree
     """
-    num_vertices = len(target_vertices)
-    distances = np.zeros(num_vertices)
-    
     print("ソースメッシュのBVHツリーを構築中...")
     
-    # ソースメッシュからBVHツリーを構築
     bm_source = bmesh.new()
     bm_source.from_mesh(source_obj.data)
     bm_source.faces.ensure_lookup_table()
     
     # ソースメッシュをワールド座標に変換
-    for v in bm_source.verts:
-        v.co = source_obj.matrix_world @ v.co
+    bmesh.ops.transform(bm_source, matrix=source_obj.matrix_world, verts=bm_source.verts)
     
-    # BVHツリーを構築
+    # BVHツリーを構築（BVHTreeは座標を保持するためbmeshはすぐに解放できる）
     source_bvh = BVHTree.FromBMesh(bm_source)
+    bm_source.free()
+    return source_bvh
+
+
+def compute_distances_to_source_mesh(target_vertices, source_obj, source_bvh=None):
+    """
+    ターゲットメッシュの各頂点からソースメッシュの最近接面までの距離を計算
+    BVHTreeを使用して高速に距離を計算
+    
+    Parameters:
+    - target_vertices: ターゲットメッシュの頂点座標（ワールド座標）
+    - source_obj: ソースメッシュオブジェクト
+    - source_bvh: 構築済みのワールド座標のBVHTree。省略時はsource_objから構築する
+    
+    Returns:
+    - 各ターゲット頂点からソースメッシュまでの距離の配列
+    """
+    if source_bvh is None:
+        source_bvh = build_world_space_bvh(source_obj)
     
     print("各頂点の最近接面までの距離を計算中...")
-    for i, vertex in enumerate(target_vertices):
-        # BVHツリーを使用して最近接点と距離を計算
-        closest_point, closest_normal, closest_face_idx, distance = source_bvh.find_nearest(vertex)
-        
-        if closest_point is not None:
-            distances[i] = distance
-        else:
-            # 最近接点が見つからない場合は大きな値を設定
-            distances[i] = 9999.0
+    distances = bvh_find_nearest_distances(source_bvh, np.asarray(target_vertices, dtype=np.float64))
     
-    # bmeshを解放
-    bm_source.free()
+    # 最近接点が見つからない場合は大きな値を設定
+    distances[np.isinf(distances)] = 9999.0
     
     print("距離計算完了")
     return distances
@@ -1014,12 +1104,11 @@ def create_partial_mesh_from_vertices(source_obj, vertex_indices):
     # ワールド変換を適用
     bm.transform(source_obj.matrix_world)
     
-    # 選択された頂点以外を削除
-    vertex_indices_set = set(vertex_indices)
-    verts_to_remove = [v for i, v in enumerate(bm.verts) if i not in vertex_indices_set]
-    
-    for v in verts_to_remove:
-        bm.verts.remove(v)
+    # 選択された頂点以外を削除（接続する辺・面ごと1回の操作でまとめて削除）
+    keep_mask = np.zeros(len(bm.verts), dtype=bool)
+    keep_mask[np.asarray(vertex_indices, dtype=np.int64)] = True
+    verts_to_remove = [v for v, keep in zip(bm.verts, keep_mask.tolist()) if not keep]
+    bmesh.ops.delete(bm, geom=verts_to_remove, context='VERTS')
     
     # 面を再計算
     bm.verts.ensure_lookup_table()
@@ -1106,33 +1195,20 @@ def add_normal_control_points_func(source_obj, control_indices, control_position
     return extended_original, extended_deformed
 
 
-def falloff_displacements(target_vertices, target_displacements, source_obj):
+def falloff_displacements(target_vertices, target_displacements, source_obj, source_bvh=None):
     """
     距離に基づいて変位にフォールオフを適用
     """
-    num_vertices = len(target_vertices)
-    
     # 各頂点のソースメッシュの最近接面までの距離を計算
     print("ソースメッシュまでの距離を計算中...")
-    distances = compute_distances_to_source_mesh(target_vertices, source_obj)
+    distances = compute_distances_to_source_mesh(target_vertices, source_obj, source_bvh)
     
     # 距離に基づく重み付け
     distances = np.maximum(distances - 0.015, 0.0)
     weights = np.minimum(1.0, smooth_step(distances * 4.0, 0.0, 1.0))
-
-    final_displacements = []
     
-    for i in range(num_vertices):
-        if weights[i] > 0:
-            # 距離に応じた重み付けを適用
-            blend_factor = weights[i]
-            next_displacement = (1.0 - blend_factor) * target_displacements[i]
-        else:
-            next_displacement = target_displacements[i]
-        
-        final_displacements.append(next_displacement)
-    
-    return final_displacements
+    # 距離に応じた重み付けを適用（重みが0の頂点は変位がそのまま残る）
+    return (1.0 - weights)[:, np.newaxis] * np.asarray(target_displacements)
 
 
 def multi_quadratic_biharmonic(r, epsilon=1.0):
@@ -1165,17 +1241,16 @@ def rbf_interpolation(source_control_points, source_control_points_deformed, tar
     if not SCIPY_AVAILABLE:
         raise ImportError("SciPyが利用できません。NumPy・SciPy再インストールボタンを使用してインストールしてください。")
     
+    # 制御点間の距離行列を計算
+    dist_matrix = cdist(source_control_points, source_control_points)
+    
     # スケーリング係数を計算：距離の標準偏差に基づく値を使用
     if epsilon <= 0:
-        # 平均距離に基づいて適切なepsilonを計算
-        dists = cdist(source_control_points, source_control_points)
-        mean_dist = np.mean(dists[dists > 0])
+        # 平均距離に基づいて適切なepsilonを計算（距離行列を使い回す）
+        mean_dist = np.mean(dist_matrix[dist_matrix > 0])
         epsilon = mean_dist  # 平均距離をepsilonとして使用
         print(f"自動計算されたepsilon: {epsilon}")
     
-    # 制御点間の距離行列を計算
-    dist_matrix = cdist(source_control_points, source_control_points)
-    
     # RBF行列を計算
     phi = multi_quadratic_biharmonic(dist_matrix, epsilon)
     
@@ -1183,15 +1258,11 @@ def rbf_interpolation(source_control_points, source_control_points_deformed, tar
     P = np.ones((num_pts, dim + 1))
     P[:, 1:] = source_control_points  # 多項式項のための拡張行列
     
-    # 完全な線形システムを構築
-    A = np.zeros((num_pts + dim + 1, num_pts + dim + 1))
-    A[:num_pts, :num_pts] = phi
-    A[:num_pts, num_pts:] = P
-    A[num_pts:, :num_pts] = P.T
+    # 完全な線形システムを構築（ゼロ初期化と部分代入を避けて一度に確保する）
+    A = np.block([[phi, P], [P.T, np.zeros((dim + 1, dim + 1))]])
     
     # 右辺を設定
-    b = np.zeros((num_pts + dim + 1, dim))
-    b[:num_pts] = displacements
+    b = np.concatenate([displacements, np.zeros((dim + 1, dim))], axis=0)
     
     # 解を求める
     try:
@@ -1221,6 +1292,10 @@ def rbf_interpolation(source_control_points, source_control_points_deformed, tar
     # 進捗表示用のカウンター
     processed_count = 0
     
+    # フォールオフ用のBVHツリーは全バッチで共通なので一度だけ構築する
+    falloff_obj = falloff_source_obj if falloff_source_obj is not None else source_obj
+    falloff_bvh = build_world_space_bvh(falloff_obj)
+    
     # バッチごとに処理
     for batch_start in range(0, total_vertices, batch_size):
         batch_end = min(batch_start + batch_size, total_vertices)
@@ -1243,20 +1318,19 @@ def rbf_interpolation(source_control_points, source_control_points_deformed, tar
         batch_displacements = np.dot(batch_phi, rbf_weights) + np.dot(batch_P, poly_weights)
         
         # フォールオフ処理を適用（一度に大量のメモリを消費するため、バッチ処理が有効）
-        falloff_obj = falloff_source_obj if falloff_source_obj is not None else source_obj
         batch_final_displacements = falloff_displacements(
             batch_world_vertices, 
             batch_displacements, 
-            falloff_obj
+            falloff_obj,
+            falloff_bvh
         )
         
         # 変位をターゲット頂点に適用（ワールド座標）
         batch_deformed_world = batch_world_vertices + batch_final_displacements
         
-        for i in range(current_batch_size):
-            target_deformed[batch_start + i] = batch_deformed_world[i]
-            target_world_vertices[batch_start + i] = batch_world_vertices[i]
-            target_displacements[batch_start + i] = batch_final_displacements[i]
+        target_deformed[batch_start:batch_end] = batch_deformed_world
+        target_world_vertices[batch_start:batch_end] = batch_world_vertices
+        target_displacements[batch_start:batch_end] = batch_final_displacements
         
         # 進捗を更新
         processed_count += current_batch_size
@@ -1346,24 +1420,17 @@ def remove_overlapping_vertices(vertices, tolerance=1e-6):
     from scipy.spatial import cKDTree
     kdtree = cKDTree(vertices)
     
-    # 各頂点について、近傍の重複を検出
-    pairs = kdtree.query_pairs(r=tolerance)
+    # 半径内の頂点ペアを1回の範囲検索でまとめて取得（Pythonのsetを経由しない）
+    pairs = kdtree.query_pairs(r=tolerance, output_type='ndarray')
     
-    # 重複している頂点のセットを作成
-    duplicate_indices = set()
-    for i, j in pairs:
-        # より小さいインデックスを保持し、大きいインデックスを重複として扱う
-        duplicate_indices.add(i)
-        duplicate_indices.add(j)
-    
-    # 重複マスクを作成
+    # 重複マスクを作成（ペアの両方の頂点を重複として扱う）
     duplicate_mask = np.zeros(len(vertices), dtype=bool)
-    duplicate_mask[list(duplicate_indices)] = True
+    duplicate_mask[pairs.ravel()] = True
     
     # 重複のない頂点のインデックスを取得
     unique_indices = np.where(~duplicate_mask)[0]
     
-    print(f"総制御点数: {len(vertices)}, 重複除去後: {len(unique_indices)}, 除去された重複点: {len(duplicate_indices)}")
+    print(f"総制御点数: {len(vertices)}, 重複除去後: {len(unique_indices)}, 除去された重複点: {np.count_nonzero(duplicate_mask)}")
     
     return unique_indices, duplicate_mask
 
@@ -1406,22 +1473,18 @@ def identify_overlapping_control_points_for_shape_keys(
             
             # シェイプキー値を設定
             source_obj.data.shape_keys.key_blocks[source_shape_key_name].value = shape_key_value
+            # view_layer.update()で評価済みなので、デプスグラフの再評価は行わない
             bpy.context.view_layer.update()
             
             # 評価後のオブジェクトを取得
             depsgraph = bpy.context.evaluated_depsgraph_get()
-            depsgraph.update()
             evaluated_source = source_obj.evaluated_get(depsgraph)
             
             # 制御点位置を取得（ローカル座標）
-            control_points_local = np.array([evaluated_source.data.vertices[i].co.copy() for i in selected_indices])
+            control_points_local = get_vertex_coordinates(evaluated_source.data.vertices)[selected_indices].astype(np.float64)
             
             # ワールド座標に変換
-            control_points_world = np.zeros_like(control_points_local)
-            for i, local_co in enumerate(control_points_local):
-                local_v = Vector((local_co[0], local_co[1], local_co[2], 1.0))
-                world_v = source_world_matrix @ local_v
-                control_points_world[i] = np.array([world_v[0], world_v[1], world_v[2]])
+            control_points_world = transform_points(source_world_matrix, control_points_local)
             
             # 法線方向制御点を追加する場合
             if add_normal_control_points:
@@ -1575,6 +1638,12 @@ def create_shape_key_from_rbf(source_obj, source_shape_key_name, selected_only=T
                 normal_distance
             )
             
+            # 選択頂点のBounding Boxはシェイプキーの値に依存しないため、ループ前に一度だけ計算する
+            # （ステップごとの編集モード切り替えとそれに伴う再評価を避ける）
+            field_bounds = None
+            if selected_only:
+                field_bounds = calculate_target_bounding_box(source_obj, bpy.context.scene.rbf_bbox_scale_factor, use_selected_vertices=True)
+            
             # 各ステップでの変形を計算
             all_displacements = []
             all_target_world_vertices = []
@@ -1605,14 +1674,10 @@ def create_shape_key_from_rbf(source_obj, source_shape_key_name, selected_only=T
                 print(f"制御点数: {len(selected_indices)} → {len(filtered_indices)} (頂点グループフィルタリング後)")
                 
                 # 変形前の状態を取得（バウンディングボックス計算用）
-                current_basis_local = np.array([evaluated_source.data.vertices[i].co.copy() for i in filtered_indices])
+                current_basis_local = get_vertex_coordinates(evaluated_source.data.vertices)[filtered_indices].astype(np.float64)
                 
                 # 変形前の状態をワールド座標に変換
-                current_basis = np.zeros_like(current_basis_local)
-                for i, basis_co in enumerate(current_basis_local):
-                    basis_v = Vector((basis_co[0], basis_co[1], basis_co[2], 1.0))
-                    world_basis = source_world_matrix @ basis_v
-                    current_basis[i] = np.array([world_basis[0], world_basis[1], world_basis[2]])
+                current_basis = transform_points(source_world_matrix, current_basis_local)
                 
                 # 現在のステップでのフィールドを生成（変形前のソースオブジェクトを使用）
                 print(f"ステップ {step+1} のDeformation Fieldを生成中...")
@@ -1624,7 +1689,8 @@ def create_shape_key_from_rbf(source_obj, source_shape_key_name, selected_only=T
                     min_distance=bpy.context.scene.rbf_min_distance,
                     density_falloff=bpy.context.scene.rbf_density_falloff,
                     bbox_scale_factor=bpy.context.scene.rbf_bbox_scale_factor,
-                    use_selected_vertices=selected_only
+                    use_selected_vertices=selected_only,
+                    bounds=field_bounds
                 )
                 
                 if field_vertices is None:
@@ -1634,22 +1700,17 @@ def create_shape_key_from_rbf(source_obj, source_shape_key_name, selected_only=T
                 # シェイプキーの値を更新して変形後の状態を取得
                 source_obj.data.shape_keys.key_blocks[source_shape_key_name].value = step_value
                 
-                # シーンを更新
+                # シーンを更新（変更されたシェイプキーの評価はここで済むため、depsgraph.update()は不要）
                 bpy.context.view_layer.update()
                 
                 # 評価後のオブジェクトを再取得
-                depsgraph.update()
                 evaluated_source_deformed = source_obj.evaluated_get(depsgraph)
                 
                 # 変形後の頂点位置を取得
-                current_deformed_local = np.array([evaluated_source_deformed.data.vertices[i].co.copy() for i in filtered_indices])
+                current_deformed_local = get_vertex_coordinates(evaluated_source_deformed.data.vertices)[filtered_indices].astype(np.float64)
                 
                 # 変形後の位置をワールド座標に変換
-                current_deformed = np.zeros_like(current_deformed_local)
-                for i, deformed_co in enumerate(current_deformed_local):
-                    deformed_v = Vector((deformed_co[0], deformed_co[1], deformed_co[2], 1.0))
-                    world_deformed = source_world_matrix @ deformed_v
-                    current_deformed[i] = np.array([world_deformed[0], world_deformed[1], world_deformed[2]])
+                current_deformed = transform_points(source_world_matrix, current_deformed_local)
                 
                 # 法線方向に制御点を追加する場合
                 if add_normal_control_points:
@@ -2011,6 +2072,7 @@ def apply_field_data(target_obj, field_data_path, shape_key_name="RBFDeform"):
     
     field_matrix = Matrix(data['world_matrix'])
     field_matrix_inv = field_matrix.inverted()
+    field_rotation = np.array(field_matrix.to_3x3())
     
     # RBFパラメータの読み込み
     rbf_epsilon = float(data.get('rbf_epsilon', 0.00001))
@@ -2031,13 +2093,14 @@ def apply_field_data(target_obj, field_data_path, shape_key_name="RBFDeform"):
     shape_key.value = 1.0
     
     # 頂点データをNumPy配列として準備
-    vertices = np.array([v.co for v in eval_mesh.vertices])
+    vertices = get_vertex_coordinates(eval_mesh.vertices).astype(np.float64)
     num_vertices = len(vertices)
     
     # 累積変位を初期化
     cumulative_displacements = np.zeros((num_vertices, 3))
-    # 現在の頂点位置（ワールド座標）を保存
-    current_world_positions = np.array([target_obj.matrix_world @ Vector(v) for v in vertices])
+    # 元の頂点位置と現在の頂点位置（ワールド座標）を保存
+    world_positions = transform_points(target_obj.matrix_world, vertices)
+    current_world_positions = world_positions.copy()
     
     # 各ステップの変位を累積的に適用
     for step in range(num_steps):
@@ -2052,7 +2115,10 @@ def apply_field_data(target_obj, field_data_path, shape_key_name="RBFDeform"):
             raise ImportError("SciPyが利用できません。NumPy・SciPy再インストールボタンを使用してインストールしてください。")
         
         # KDTreeを使用して近傍点を検索（各ステップで新しいKDTreeを構築）
-        kdtree = cKDTree(field_points)
+        kdtree = cKDTree(field_points, leafsize=16, balanced_tree=True, compact_nodes=True)
+        
+        # 近傍点の数（最大8点）
+        k = min(8, len(field_points))
         
         # カスタムRBF補間で新しい頂点位置を計算
         batch_size = 1000
@@ -2060,42 +2126,35 @@ def apply_field_data(target_obj, field_data_path, shape_key_name="RBFDeform"):
         
         for start_idx in range(0, num_vertices, batch_size):
             end_idx = min(start_idx + batch_size, num_vertices)
-            batch_vertices = vertices[start_idx:end_idx]
             
             # バッチ内の全頂点をフィールド空間に変換（現在の累積変位を考慮）
-            batch_world = current_world_positions[start_idx:end_idx].copy()
-            batch_field = np.array([field_matrix_inv @ Vector(v) for v in batch_world])
+            batch_field = transform_points(field_matrix_inv, current_world_positions[start_idx:end_idx])
             
-            # 各頂点ごとに逆距離加重法で補間
-            batch_displacements = np.zeros((len(batch_field), 3))
+            # バッチ内の全頂点の近傍点を一括で検索（全コアで並列に検索）
+            distances, indices = kdtree.query(batch_field, k=k, workers=-1)
+            if k == 1:
+                distances = distances[:, np.newaxis]
+                indices = indices[:, np.newaxis]
             
-            for i, point in enumerate(batch_field):
-                # 近傍点を検索（最大8点）
-                k = min(8, len(field_points))
-                distances, indices = kdtree.query(point, k=k)
-                
-                # 距離が0の場合（完全に一致する点がある場合）
-                if distances[0] < 1e-10:
-                    batch_displacements[i] = delta_positions[indices[0]]
-                    continue
-                
-                # 逆距離の重みを計算
-                weights = 1.0 / np.sqrt(distances**2 + rbf_epsilon**2)
-                
-                # 重みの正規化
-                weights /= np.sum(weights)
-                
-                # 重み付き平均で変位を計算
-                weighted_deltas = delta_positions[indices] * weights[:, np.newaxis]
-                batch_displacements[i] = np.sum(weighted_deltas, axis=0)
+            # 逆距離の重みを計算
+            weights = 1.0 / np.sqrt(distances**2 + rbf_epsilon**2)
+            
+            # 重みの正規化
+            weights /= np.sum(weights, axis=1, keepdims=True)
+            
+            # 重み付き平均で変位を計算（各頂点ごとの逆距離加重法）
+            batch_displacements = np.sum(delta_positions[indices] * weights[:, :, np.newaxis], axis=1)
+            
+            # 距離が0の場合（完全に一致する点がある場合）
+            exact_match = distances[:, 0] < 1e-10
+            batch_displacements[exact_match] = delta_positions[indices[exact_match, 0]]
             
             # ワールド空間での変位を計算
-            for i, displacement in enumerate(batch_displacements):
-                world_displacement = field_matrix.to_3x3() @ Vector(displacement)
-                step_displacements[start_idx + i] = world_displacement
-                
-                # 現在のワールド位置を更新（次のステップのために）
-                current_world_positions[start_idx + i] += world_displacement
+            world_displacements = batch_displacements @ field_rotation.T
+            step_displacements[start_idx:end_idx] = world_displacements
+            
+            # 現在のワールド位置を更新（次のステップのために）
+            current_world_positions[start_idx:end_idx] += world_displacements
         
         # このステップの変位を累積変位に追加
         cumulative_displacements += step_displacements
@@ -2108,22 +2167,19 @@ def apply_field_data(target_obj, field_data_path, shape_key_name="RBFDeform"):
         print("Armatureモディファイアが見つかりません")
     
     # 累積変位を適用して最終的な頂点位置を計算
-    results = np.zeros((num_vertices, 3))
-    for i in range(num_vertices):
-        # 元のワールド位置に累積変位を加えた位置をローカル座標に変換
-        world_pos = target_obj.matrix_world @ Vector(vertices[i])
-        final_world_pos = world_pos + Vector(cumulative_displacements[i])
-        if armature_obj:
-            matrix_armature_inv = calculate_inverse_pose_matrix(target_obj, armature_obj, i)
-            undeformed_world_pos = matrix_armature_inv @ Vector(final_world_pos)
-        else:
-            undeformed_world_pos = Vector(final_world_pos)
-        local_pos = target_obj.matrix_world.inverted() @ undeformed_world_pos
-        results[i] = local_pos
-    
-    # 結果をシェイプキーに適用
-    for i, local_pos in enumerate(results):
-        shape_key.data[i].co = local_pos
+    # 元のワールド位置に累積変位を加えた位置をローカル座標に変換
+    final_world_positions = world_positions + cumulative_displacements
+    if armature_obj:
+        undeformed_world_positions = np.array([
+            calculate_inverse_pose_matrix(target_obj, armature_obj, i) @ Vector(final_world_pos)
+            for i, final_world_pos in enumerate(final_world_positions)
+        ]).reshape(-1, 3)
+    else:
+        undeformed_world_positions = final_world_positions
+    # ローカル座標は書き込み用のバッファに直接求め、そのままシェイプキーに適用
+    results = get_coordinate_buffer(num_vertices).reshape(-1, 3)
+    transform_points(target_obj.matrix_world.inverted(), undeformed_world_positions, out=results)
+    set_vertex_coordinates(shape_key.data, results)
     
     print(f"すべてのステップの累積変形を適用しました: {shape_key_name}")
     print(f"最終的な累積変位の最大値: {np.max(np.linalg.norm(cumulative_displacements, axis=1)):.6f}")
@@ -3721,6 +3777,12 @@ def export_rbf_temp_data(source_obj, source_shape_key_name, selected_only=True,
                 normal_distance
             )
             
+            # 選択頂点のBounding Boxはシェイプキーの値に依存しないため、ループ前に一度だけ計算する
+            # （ステップごとの編集モード切り替えとそれに伴う再評価を避ける）
+            field_bounds = None
+            if selected_only:
+                field_bounds = calculate_target_bounding_box(source_obj, bpy.context.scene.rbf_bbox_scale_factor, use_selected_vertices=True)
+            
             # 各ステップでのフィールドデータと変形データを収集
             all_step_data = []
             all_field_world_vertices = []
@@ -3751,14 +3813,10 @@ def export_rbf_temp_data(source_obj, source_shape_key_name, selected_only=True,
                 print(f"制御点数: {len(selected_indices)} → {len(filtered_indices)} (頂点グループフィルタリング後)")
                 
                 # 変形前の状態を取得（バウンディングボックス計算用）
-                current_basis_local = np.array([evaluated_source.data.vertices[i].co.copy() for i in filtered_indices])
+                current_basis_local = get_vertex_coordinates(evaluated_source.data.vertices)[filtered_indices].astype(np.float64)
                 
                 # 変form前の状態をワールド座標に変換
-                current_basis = np.zeros_like(current_basis_local)
-                for i, basis_co in enumerate(current_basis_local):
-                    basis_v = Vector((basis_co[0], basis_co[1], basis_co[2], 1.0))
-                    world_basis = source_world_matrix @ basis_v
-                    current_basis[i] = np.array([world_basis[0], world_basis[1], world_basis[2]])
+                current_basis = transform_points(source_world_matrix, current_basis_local)
                 
                 # 現在のステップでのフィールドを生成（変形前のソースオブジェクトを使用）
                 print(f"ステップ {step+1} のDeformation Fieldを生成中...")
@@ -3770,36 +3828,31 @@ def export_rbf_temp_data(source_obj, source_shape_key_name, selected_only=True,
                     min_distance=bpy.context.scene.rbf_min_distance,
                     density_falloff=bpy.context.scene.rbf_density_falloff,
                     bbox_scale_factor=bpy.context.scene.rbf_bbox_scale_factor,
-                    use_selected_vertices=selected_only
+                    use_selected_vertices=selected_only,
+                    bounds=field_bounds
                 )
                 
                 if field_vertices is None:
                     print(f"ステップ {step+1} でフィールドの生成に失敗しました")
                     continue
                 
-                # VectorオブジェクトをPython配列に変換（Pickle化可能にするため）
-                field_vertices_array = np.array([[v.x, v.y, v.z] for v in field_vertices])
-                all_field_world_vertices.append(field_vertices_array)
+                # フィールド頂点はワールド座標のnumpy配列として返される
+                all_field_world_vertices.append(field_vertices)
                 
                 # シェイプキーの値を更新して変形後の状態を取得
                 source_obj.data.shape_keys.key_blocks[source_shape_key_name].value = step_value
                 
-                # シーンを更新
+                # シーンを更新（変更されたシェイプキーの評価はここで済むため、depsgraph.update()は不要）
                 bpy.context.view_layer.update()
                 
                 # 評価後のオブジェクトを再取得
-                depsgraph.update()
                 evaluated_source_deformed = source_obj.evaluated_get(depsgraph)
                 
                 # 変形後の頂点位置を取得
-                current_deformed_local = np.array([evaluated_source_deformed.data.vertices[i].co.copy() for i in filtered_indices])
+                current_deformed_local = get_vertex_coordinates(evaluated_source_deformed.data.vertices)[filtered_indices].astype(np.float64)
                 
                 # 変形後の位置をワールド座標に変換
-                current_deformed = np.zeros_like(current_deformed_local)
-                for i, deformed_co in enumerate(current_deformed_local):
-                    deformed_v = Vector((deformed_co[0], deformed_co[1], deformed_co[2], 1.0))
-                    world_deformed = source_world_matrix @ deformed_v
-                    current_deformed[i] = np.array([world_deformed[0], world_deformed[1], world_deformed[2]])
+                current_deformed = transform_points(source_world_matrix, current_deformed_local)
                 
                 # 法線方向に制御点を追加する場合
                 if add_normal_control_points: